@@ -12,8 +12,8 @@ import pdb
 ### Command line interface for downloading Sentinel-2 data ###
 ##############################################################
 
-def main(username, password, tiles, level = '1C', start = '20150523', end = datetime.datetime.today().strftime('%Y%m%d'), maxcloud = 100, minsize = 25., output_dir = os.getcwd(), remove = False):
-    """main(username, password, tiles, level = '1C', start = '20150523', end = datetime.datetime.today().strftime('%Y%m%d'), maxcloud = 100, minsize = 25., output_dir = os.getcwd(), remove = False)
+def main(username, password, tiles, level = '1C', start = '20150523', end = datetime.datetime.today().strftime('%Y%m%d'), maxcloud = 100, minsize = 25., output_dir = None, remove = False):
+    """main(username, password, tiles, level = '1C', start = '20150523', end = datetime.datetime.today().strftime('%Y%m%d'), maxcloud = 100, minsize = 25., output_dir = None, remove = False)
     
     Download Sentinel-2 data from the Copernicus Open Access Hub, specifying a particular tile, date ranges and degrees of cloud cover. This is the function that is initiated from the command line.
     
@@ -30,6 +30,8 @@ def main(username, password, tiles, level = '1C', start = '20150523', end = date
         remove: Boolean value, which when set to True deletes level 1C .zip files after decompression is complete. Defaults to False.
     """
     
+    if output_dir is None: output_dir = os.getcwd()
+    
     # Allow download of single tile
     if type(tiles) == str: tiles = [tiles]
     
@@ -51,10 +51,10 @@ def _getBands(resolution, bands_whitelist):
 
 def main(source_files, extent_dest, EPSG_dest, resolution = 0, percentile = 25.,
          level = '1C', start = '20150101', end = datetime.datetime.today().strftime('%Y%m%d'), improve_mask = False,
-         colour_balance = False, processes = 1, output_dir = os.getcwd(), output_name = 'mosaic', masked_vals = 'auto',
+         colour_balance = False, processes = 1, output_dir = None, output_name = 'mosaic', masked_vals = 'auto',
          temp_dir = '/tmp', verbose = False,
          bands  = ["B01", "B02", "B8A"]) :
-    """main(source_files, extent_dest, EPSG_dest, start = '20150101', end = datetime.datetime.today().strftime('%Y%m%d'), resolution = 0, improve_mask = False, colour_balance = False, processes = 1, output_dir = os.getcwd(), output_name = 'mosaic', masked_vals = 'auto', temp_dir = '/tmp', verbose = False)
+    """main(source_files, extent_dest, EPSG_dest, start = '20150101', end = datetime.datetime.today().strftime('%Y%m%d'), resolution = 0, improve_mask = False, colour_balance = False, processes = 1, output_dir = None, output_name = 'mosaic', masked_vals = 'auto', temp_dir = '/tmp', verbose = False)
     
     Function to generate seamless mosaics from a list of Sentinel-2 level-2A input files.
         
@@ -69,13 +69,15 @@ def main(source_files, extent_dest, EPSG_dest, resolution = 0, percentile = 25.,
         end: End date to process, in format 'YYYYMMDD' Defaults to today's date.
         improve_mask: Set True to apply improvements Sentinel-2 cloud mask. Not generally recommended.
         processes: Number of processes to run similtaneously. Defaults to 1.
-        output_dir: Optionally specify an output directory.
+        output_dir: Optionally specify an output directory. Defaults to the present working directory.
         output_name: Optionally specify a string to precede output file names. Defaults to 'mosaic'.
         masked_vals: List of SLC mask values to not include in the final mosaic. Defaults to 'auto', which masks everything except [4,5,6]
         temp_dir: Directory to temporarily write L1C mask files. Defaults to /tmp
         verbose: Make script verbose (set True).
     """
     
+    if output_dir is None: output_dir = os.getcwd()
+    
     # Get output bands based on input resolution
     res_list, band_list = _getBands(resolution, bands_whitelist=bands)
     
@@ -15,7 +15,7 @@ import pdb
 ### Command line interface for preprocessing Sentinel-2 L1C data ###
 ####################################################################
 
-def main(infile, gipp = None, output_dir = os.getcwd(), resolution = 0, sen2cor = 'L2A_Process', sen2cor_255 = None, verbose = False):
+def main(infile, gipp = None, output_dir = None, resolution = 0, sen2cor = 'L2A_Process', sen2cor_255 = None, verbose = False):
     """
     Function to initiate sen2cor on level 1C Sentinel-2 files and perform improvements to cloud masking. This is the function that is initiated from the command line.
     
@@ -27,26 +27,17 @@ def main(infile, gipp = None, output_dir = os.getcwd(), resolution = 0, sen2cor
     
     assert resolution in [0, 10, 20, 60], "Resolution must be set to 0, 10, 20 or 60 m."
     
-    resolutions = [resolution] if resolution != 0 else [10, 20, 60]
-    
     if verbose: print('Processing %s'%infile.split('/')[-1])
     
-    try:
-        
-        # Loop through all resolutions if set to 0
-        for resolution in resolutions:
-            
-            S2_scene = sen2mosaic.core.LoadScene(infile, resolution = resolution)
-            
-            L2A_file = S2_scene.processToL2A(gipp = gipp, output_dir = output_dir, resolution = resolution, sen2cor = sen2cor, sen2cor_255 = sen2cor_255, verbose = verbose)
+    # A single sen2cor run produces all resolutions when resolution is 0 (or 10, as 10 m output depends on the 20 and 60 m processing), so there's no need to loop through resolutions
+    S2_scene = sen2mosaic.core.LoadScene(infile, resolution = 20 if resolution == 0 else resolution)
+    
+    L2A_file = S2_scene.processToL2A(gipp = gipp, output_dir = output_dir, resolution = resolution, sen2cor = sen2cor, sen2cor_255 = sen2cor_255, verbose = verbose)
     
-    except Exception as e:
-        raise
-                
     # Test for completion, and report back
     if sen2mosaic.preprocess.testCompletion(infile, output_dir = output_dir, resolution = resolution) == False:   
         
-        print('WARNING: %s did not complete processing at %s m resolution.'%(infile, str(resolution)))
+        print('WARNING: %s did not complete processing at %s.'%(infile, 'all resolutions' if resolution == 0 else '%s m resolution'%str(resolution)))
     
 
 if __name__ == '__main__':
@@ -83,19 +74,28 @@ if __name__ == '__main__':
     # Get absolute path for output directory
     args.output_dir = os.path.abspath(args.output_dir)
     
-    # Strip the output files already exist.
-    for infile in infiles[:]:
+    if len(infiles) == 0: raise ValueError('No level 1C Sentinel-2 files detected in input directory that match specification.')
+    
+    # List the output directory once, rather than searching it again for each input file
+    output_files = os.listdir(args.output_dir) if os.path.isdir(args.output_dir) else []
+    
+    # Skip files where the output already exists. These stay in infiles, so are still included in the completion report.
+    to_process = []
+    for infile in infiles:
         outpath = sen2mosaic.preprocess.getL2AFilename(infile, output_dir = args.output_dir)
         
-        if os.path.exists(outpath):
+        if len(sen2mosaic.preprocess.findL2AOutput(outpath, output_files = output_files)) > 0:
             print('WARNING: The output file %s already exists! Skipping file.'%outpath)
+        else:
+            to_process.append(infile)
+    
+    # No point starting more processes than there are files to process
+    args.n_processes = max(1, min(args.n_processes, len(to_process)))
     
-    if len(infiles) == 0: raise ValueError('No level 1C Sentinel-2 files detected in input directory that match specification.')
-        
     if args.n_processes == 1:
         
         # Keep things simple when using one processor
-        for infile in infiles:
+        for infile in to_process:
             
             main(infile, gipp = args.gipp, output_dir = args.output_dir, resolution = args.resolution, sen2cor = args.sen2cor, sen2cor_255 = args.sen2cor255, verbose = args.verbose) 
     
@@ -104,7 +104,7 @@ if __name__ == '__main__':
         # Set up function with multiple arguments, and run in parallel
         main_partial = functools.partial(main, gipp = args.gipp, output_dir = args.output_dir, resolution = args.resolution, sen2cor = args.sen2cor, sen2cor_255 = args.sen2cor255, verbose = args.verbose)
     
-        sen2mosaic.multiprocess.runWorkers(main_partial, args.n_processes, infiles)
+        sen2mosaic.multiprocess.runWorkers(main_partial, args.n_processes, to_process)
     
     # Test for completion
     completion = np.array([sen2mosaic.preprocess.testCompletion(infile, output_dir = args.output_dir, resolution = args.resolution) for infile in infiles])
@@ -14,6 +14,9 @@ import sen2mosaic
 
 import pdb
 
+# Sentinel-2 tile names take the format '##XXX' (e.g. '36KWA')
+_TILE_RE = re.compile(r'[0-9]{2}[A-Z]{3}\Z')
+
 ### Functions for data input and output, and image reprojection
 
 
@@ -73,7 +76,7 @@ def _reprojectImage(ds_source, ds_dest, md_source, md_dest, resampling = 0):
         ds_source_mask = _copyds(ds_source)
         ds_dest_mask = _copyds(ds_dest)
         #ds_source_mask.GetRasterBand(1).WriteArray(np.ones_like(ds_source.GetRasterBand(1).ReadAsArray()))
-        ds_source_mask.GetRasterBand(1).WriteArray(np.ones((ds_source.RasterYSize, ds_source.RasterXSize), dtype = np.bool))
+        ds_source_mask.GetRasterBand(1).WriteArray(np.ones((ds_source.RasterYSize, ds_source.RasterXSize), dtype = bool))
         gdal.ReprojectImage(ds_source_mask, ds_dest_mask, proj_source, proj_dest, gdal.GRA_NearestNeighbour)
         ds_resampled[ds_dest_mask.GetRasterBand(1).ReadAsArray() == 0] = ds_source.GetRasterBand(1).GetNoDataValue()
     """
@@ -265,13 +268,13 @@ def loadShapefile(shp, md_dest, field = '', field_values = ''):
         this_dtype = sf.fields[1:][field_n][1]
 
         if this_dtype == 'N':
-            dtype = np.int
+            dtype = int
         elif this_dtype == 'F':
             dtype = np.float32
         elif this_dtype == 'C':
-            dtype = np.str
+            dtype = str
         else:
-            dtype = np.str
+            dtype = str
 
         value_out = []
 
@@ -575,15 +578,17 @@ def loadMetadata(granule_file, resolution = 20, level = '2A', tile = ''):
     
     if tile == '':
         # Get tile from granule filename
-        if granule_file.split('/')[-1].split('_')[1] == 'USER':
+        granule_parts = os.path.basename(granule_file).split('_')
+        
+        if granule_parts[1] == 'USER':
             
             # If old file format
-            tile = granule_file.split('/')[-1].split('_')[-2]
+            tile = granule_parts[-2]
             
         else:
             
             # If new file format
-            tile = granule_file.split('/')[-1].split('_')[1]
+            tile = granule_parts[1]
     
     return extent, EPSG, date, tile, nodata_percent
 
@@ -593,6 +598,33 @@ def loadMetadata(granule_file, resolution = 20, level = '2A', tile = ''):
 ### Sentinel-2 input files ###
 ##############################
 
+def _scanGranules(directory, level):
+    """
+    Function to list the granules of all Sentinel-2 .SAFE files in a directory. Equivalent to glob('directory/*_MSIL{level}_*/GRANULE/*'), but filters .SAFE files by name in a single pass over the directory.
+    
+    Args:
+        directory: A directory containing Sentinel-2 .SAFE files.
+        level: Set to either '1C' or '2A' to select appropriate .SAFE files.
+    Returns:
+        A list of granules in the directory.
+    """
+    
+    granules = []
+    
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            
+            # Skip hidden files and anything that isn't a .SAFE file of the correct level
+            if entry.name.startswith('.') or '_MSIL%s_'%level not in entry.name: continue
+            
+            granule_dir = os.path.join(entry.path, 'GRANULE')
+            if not os.path.isdir(granule_dir): continue
+            
+            granules.extend([os.path.join(granule_dir, granule) for granule in os.listdir(granule_dir) if not granule.startswith('.')])
+    
+    return granules
+
+
 def prepInfiles(infiles, level, tile = ''):
     """
     Function to select input granules from a directory, .SAFE file (with wildcards) or granule, based on processing level and a tile. Used by command line interface to identify input files.
@@ -606,7 +638,7 @@ def prepInfiles(infiles, level, tile = ''):
     """
     
     assert level in ['1C', '2A'], "Sentinel-2 processing level must be either '1C' or '2A'."
-    assert bool(re.match("[0-9]{2}[A-Z]{3}$",tile)) or tile == '', "Tile format not recognised. It should take the format '##XXX' (e.g. '36KWA')."
+    assert bool(_TILE_RE.match(tile)) or tile == '', "Tile format not recognised. It should take the format '##XXX' (e.g. '36KWA')."
     
     # Make interable if only one item
     if not isinstance(infiles, list):
@@ -629,10 +661,13 @@ def prepInfiles(infiles, level, tile = ''):
         infile = infile.rstrip('/')
          
         # Where infile is a directory:
-        infiles_reduced.extend(glob.glob('%s/*_MSIL%s_*/GRANULE/*'%(infile, level)))
+        if os.path.isdir(infile):
+            infiles_reduced.extend(_scanGranules(infile, level))
+        else:
+            infiles_reduced.extend(glob.glob('%s/*_MSIL%s_*/GRANULE/*'%(infile, level)))
         
         # Where infile is a .SAFE file
-        if '_MSIL%s_'%level in infile.split('/')[-1]: infiles_reduced.extend(glob.glob('%s/GRANULE/*'%infile))
+        if '_MSIL%s_'%level in os.path.basename(infile): infiles_reduced.extend(glob.glob('%s/GRANULE/*'%infile))
         
         # Where infile is a specific granule 
         if len(infile.split('/')) >1 and infile.split('/')[-2] == 'GRANULE': infiles_reduced.extend(glob.glob('%s'%infile))
@@ -641,7 +676,7 @@ def prepInfiles(infiles, level, tile = ''):
     infiles_reduced = list(set(infiles_reduced))
     
     # Reduce input to infiles that match the tile (where specified)
-    infiles_reduced = [infile for infile in infiles_reduced if ('_T%s'%tile in infile.split('/')[-1])]
+    infiles_reduced = [infile for infile in infiles_reduced if ('_T%s'%tile in os.path.basename(infile))]
     
     # Reduce input files to only L1C or L2A files
     infiles_reduced = [infile for infile in infiles_reduced if ('_MSIL%s_'%level in infile.split('/')[-3])]
@@ -688,6 +723,10 @@ def loadSceneList(infiles, resolution = 20, md_dest = None, start = '20150101',
     # Prepare input string, or list of files
     source_files = prepInfiles(infiles, level)
     
+    # Parse date range once, rather than for every scene
+    start = datetime.datetime.strptime(start, '%Y%m%d')
+    end = datetime.datetime.strptime(end, '%Y%m%d')
+    
     scenes = []
     for source_file in source_files:
         try:
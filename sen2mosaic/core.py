@@ -385,7 +385,7 @@ class LoadScene(object):
         iterations = int(round(1800/float(self.resolution)))
         
         # Identify pixels proximal to any measure of cloud cover
-        cloud_dilated = scipy.ndimage.morphology.binary_dilation((np.logical_or(mask==8, mask==9)).astype(np.int), iterations = iterations)
+        cloud_dilated = scipy.ndimage.morphology.binary_dilation((np.logical_or(mask==8, mask==9)).astype(int), iterations = iterations)
         
         # Set these to dark features
         mask[np.logical_and(np.logical_or(mask == 2, mask == 3), cloud_dilated)] = 3
@@ -401,7 +401,7 @@ class LoadScene(object):
             for i in [3,8,9]:
                             
                 # Grow the area of each input class
-                mask_dilate = scipy.ndimage.morphology.binary_dilation((mask==i).astype(np.int), iterations = iterations)
+                mask_dilate = scipy.ndimage.morphology.binary_dilation((mask==i).astype(int), iterations = iterations)
                 
                 # Set dilated area to the same value as input class (except for high probability cloud, set to medium)
                 mask_temp[mask_dilate] = i if i is not 9 else 8
@@ -412,14 +412,14 @@ class LoadScene(object):
         iterations = int(round(600 / float(self.resolution)))
         
         # Grow the area of nodata pixels (everything that is equal to 0)
-        mask_erode = scipy.ndimage.morphology.binary_dilation((mask_orig == 0).astype(np.int), iterations=iterations)
+        mask_erode = scipy.ndimage.morphology.binary_dilation((mask_orig == 0).astype(int), iterations=iterations)
         
         # Set these eroded areas to 0
         mask[mask_erode == True] = 0
                     
         return mask
     
-    def processToL2A(self, gipp = None, output_dir = os.getcwd(), resolution = 0, sen2cor = 'L2A_Process', sen2cor_255 = None, verbose = False):
+    def processToL2A(self, gipp = None, output_dir = None, resolution = 0, sen2cor = 'L2A_Process', sen2cor_255 = None, verbose = False):
         '''
         Function to process L1C data to L2A using sen2cor.
         
@@ -471,15 +471,15 @@ class LoadScene(object):
         Function that uses metadata class to test whether a tile falls within the specified time range.
         
         Args:
-            start: Start date to process, in format 'YYYYMMDD' Defaults to start of Sentinel-2 era.
-            end: End date to process, in format 'YYYYMMDD' Defaults to today's date.
+            start: Start date to process, in format 'YYYYMMDD' or as a datetime object. Defaults to start of Sentinel-2 era.
+            end: End date to process, in format 'YYYYMMDD' or as a datetime object. Defaults to today's date.
             
         Returns:
             A boolean (True/False) value.
         '''
-                
-        start = datetime.datetime.strptime(start,'%Y%m%d')
-        end = datetime.datetime.strptime(end,'%Y%m%d')
+        
+        if isinstance(start, str): start = datetime.datetime.strptime(start,'%Y%m%d')
+        if isinstance(end, str): end = datetime.datetime.strptime(end,'%Y%m%d')
         
         if self.datetime > end:
             return False
@@ -508,7 +508,7 @@ class LoadScene(object):
             mask_nodata = self.getBand('B02', chunk = chunk) == 0
              
             # Initiate mask to pass all (4 = vegetation)
-            mask = np.zeros_like(mask_clouds, dtype = np.int) + 4
+            mask = np.zeros_like(mask_clouds, dtype = int) + 4
             mask[mask_clouds] = 9
             mask[mask_nodata] = 0
             
@@ -598,7 +598,7 @@ class LoadScene(object):
                 image_path = self.__getImagePath(band, resolution = 60)
         
         # Re-cast chunk based on upcoming zoom factor
-        if chunk is not None: chunk = np.round(np.array(chunk) / float(zoom),0).astype(np.int).tolist()
+        if chunk is not None: chunk = np.round(np.array(chunk) / float(zoom),0).astype(int).tolist()
         
         # Load the image (.jp2 format)
         if chunk is None:
@@ -610,7 +610,7 @@ class LoadScene(object):
         if zoom > 1:
              data = scipy.ndimage.zoom(data, zoom, order = 0)
         if zoom < 1:
-            data = np.round(skimage.measure.block_reduce(data, block_size = (int(1./zoom), int(1./zoom)), func = np.mean), 0).astype(np.int)
+            data = np.round(skimage.measure.block_reduce(data, block_size = (int(1./zoom), int(1./zoom)), func = np.mean), 0).astype(int)
 
         # Reproject?
         if md is not None:
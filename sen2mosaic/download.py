@@ -12,6 +12,9 @@ import zipfile
 
 import pdb
 
+# Sentinel-2 tile names take the format '##XXX' (e.g. '36KWA')
+_TILE_RE = re.compile(r'[0-9]{2}[A-Z]{3}\Z')
+
 
 #################################################
 ### Functions for downloading Sentinel-2 data ###
@@ -99,7 +102,7 @@ def search(tile, level = '1C', start = '20150523', end = datetime.datetime.today
     assert 'scihub_api' in globals(), "The global variable scihub_api doesn't exist. You should run connectToAPI(username, password) before searching the data archive."
 
     # Validate tile input format for search
-    assert bool(re.match("[0-9]{2}[A-Z]{3}$",tile)), "The tile name input (%s) does not match the format ##XXX (e.g. 36KWA)."%tile
+    assert bool(_TILE_RE.match(tile)), "The tile name input (%s) does not match the format ##XXX (e.g. 36KWA)."%tile
     
     assert level in ['1C', '2A'], "Level must be '1C' or '2A'."
     
@@ -129,8 +132,8 @@ def search(tile, level = '1C', start = '20150523', end = datetime.datetime.today
     return products_df
 
 
-def download(products_df, output_dir = os.getcwd()):
-    ''' download(products_df, output_dir = os.getcwd())
+def download(products_df, output_dir = None):
+    ''' download(products_df, output_dir = None)
     
     Downloads all images from a dataframe produced by sentinelsat.
     
@@ -139,6 +142,8 @@ def download(products_df, output_dir = os.getcwd()):
         output_dir: Optionally specify an output directory. Defaults to the present working directory.
     '''
     
+    if output_dir is None: output_dir = os.getcwd()
+    
     assert os.path.isdir(output_dir), "Output directory doesn't exist."
     
     if products_df.empty == True:
@@ -173,8 +178,8 @@ def download(products_df, output_dir = os.getcwd()):
     return downloaded_files
 
 
-def decompress(zip_files, output_dir = os.getcwd(), remove = False):
-    '''decompress(zip_files, output_dir = os.getcwd(), remove = False
+def decompress(zip_files, output_dir = None, remove = False):
+    '''decompress(zip_files, output_dir = None, remove = False)
     
     Decompresses .zip files downloaded from SciHub, and optionally removes original .zip file.
     
@@ -183,7 +188,9 @@ def decompress(zip_files, output_dir = os.getcwd(), remove = False):
         output_dir: Optionally specify an output directory. Defaults to the present working directory.
         remove: Boolean value, which when set to True deletes level 1C .zip files after decompression is complete. Defaults to False.
     '''
-
+    
+    if output_dir is None: output_dir = os.getcwd()
+    
     if type(zip_files) == str: zip_files = [zip_files]
     
     for zip_file in zip_files:
@@ -147,13 +147,13 @@ def _doComposite(input_list):
     # If nodata in the entire chunk, skip processing
     if m.sum() == 0: return np.zeros_like(b[0,:,:]).astype(np.uint16), np.zeros_like(b[0,:,:]).astype(np.uint8)
     
-    bm = np.ma.array(b, mask = np.ones_like(m,dtype=np.bool))
+    bm = np.ma.array(b, mask = np.ones_like(m,dtype=bool))
     
     # Build output arrays
-    nodata = np.ones_like(b[0,:,:], dtype = np.bool)
+    nodata = np.ones_like(b[0,:,:], dtype = bool)
     slc = np.zeros_like(b[0,:,:], dtype = np.uint8)
     slc_count = np.zeros_like(b[0,:,:], dtype = np.uint8)
-    slc_assigned = np.zeros_like(b[0,:,:], dtype = np.bool)
+    slc_assigned = np.zeros_like(b[0,:,:], dtype = bool)
     
     # Add pixels in order of desirability
     for n, vals in enumerate([[4,5,6], [2,7,11], [1,3,8,10], [9]]):
@@ -285,7 +285,7 @@ def _colourBalance(image, reference, aggressive = True, verbose = False):
 ### Primary functions ###
 #########################
 
-def buildComposite(source_files, band, md_dest, resolution = 20, level = '2A', output_dir = os.getcwd(),
+def buildComposite(source_files, band, md_dest, resolution = 20, level = '2A', output_dir = None,
                    output_name = 'mosaic', start = '20150101', end = datetime.datetime.today().strftime('%Y%m%d'),
                    step = 2000, improve_mask = False, processes = 1, percentile = 25., colour_balance = False,
                    masked_vals = 'auto', output_mask = True, temp_dir = '/tmp', verbose = False, resampling = 0):
@@ -303,7 +303,7 @@ def buildComposite(source_files, band, md_dest, resolution = 20, level = '2A', o
         resolution: Resolution band 10, 20, or 60 m band to use. Defaults to 20.
         improve_mask: Set True to apply improvements Sentinel-2 cloud mask. Not generally recommended.
         processes: Number of processes to run similtaneously. Defaults to 1.
-        output_dir: Optionally specify an output directory.
+        output_dir: Optionally specify an output directory. Defaults to the present working directory.
         output_name: Optionally specify a string to precede output file names. Defaults to 'mosaic'.
         masked_vals: List of SLC mask values to not include in the final mosaic. Defaults to 'auto', which masks everything except [4,5,6]
         temp_dir: Directory to temporarily write L1C mask files. Defaults to /tmp
@@ -323,6 +323,7 @@ def buildComposite(source_files, band, md_dest, resolution = 20, level = '2A', o
     assert type(masked_vals) == list, "Masked values must be a list of integers, or set to 'auto' or 'none'."
     
     # Test that output directory is writeable
+    if output_dir is None: output_dir = os.getcwd()
     output_dir = os.path.abspath(os.path.expanduser(output_dir))
     assert os.path.exists(output_dir), "Output directory (%s) does not exist."%output_dir
     assert os.access(output_dir, os.W_OK), "Output directory (%s) does not have write permission. Try setting a different output directory, or changing permissions with chmod."%output_dir
@@ -99,6 +99,8 @@ def runCommand(command, verbose = False):
     Args:
         command: A list containing a command for subprocess.Popen().
         verbose: Set True to print command progress
+    Returns:
+        A list of lines output by the command. Output is only captured where verbose is True.
     """
     
     try:
@@ -113,25 +115,33 @@ def runCommand(command, verbose = False):
                 
         signal.signal(signal.SIGINT, handler)
         
-        p = subprocess.Popen(command, stdout = subprocess.PIPE, stderr = subprocess.PIPE)
+        # When verbose, merge stderr into stdout so that an unread stderr pipe can't fill and block the process. Otherwise discard stdout, keeping only stderr to report failures.
+        if verbose:
+            p = subprocess.Popen(command, stdout = subprocess.PIPE, stderr = subprocess.STDOUT, bufsize = -1)
+        else:
+            p = subprocess.Popen(command, stdout = subprocess.DEVNULL, stderr = subprocess.PIPE)
+        
+        text, error_text = b'', b''
         
         # Optionally print progress, skipping out with KeyboardInterrupt
         if verbose:
-            while True:
-                stdout_line = p.stdout.readline().decode('utf-8')
-                if stdout_line == '' and p.poll() is not None:
-                    break
-                if stdout_line:
-                    print(stdout_line)
+            stdout_lines = []
+            for stdout_line in p.stdout:
+                stdout_lines.append(stdout_line)
+                print(stdout_line.decode('utf-8', errors = 'replace').rstrip('\n'))
+            
+            # Keep captured output, which communicate() would otherwise discard as already read
+            text = b''.join(stdout_lines)
+        
+        else:
+            error_text = p.communicate()[1]
         
-        text = p.communicate()[0]
-                
         if p.wait():
-            raise Exception('Command failed: %s'%' '.join(command))
+            raise Exception('Command failed: %s\n%s'%(' '.join(command), error_text.decode('utf-8', errors = 'replace')))
         
     finally:
         # Reset handler
         signal.signal(signal.SIGINT, signal.SIG_DFL)
     
-    return text.decode('utf-8').split('/n')
+    return text.decode('utf-8', errors = 'replace').splitlines()
 
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 
+import fnmatch
 import glob
 import numpy as np
 import os
@@ -9,12 +10,20 @@ from scipy import ndimage
 import shutil
 import tempfile
 import time
-import xml.etree.ElementTree as ET
+
+try:
+    import lxml.etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 
 import sen2mosaic.multiprocess
 
 import pdb
 
+# Processing baseline (e.g. '_N0205') and processing date (e.g. '_20170608T081508.SAFE') in Sentinel-2 filenames
+_BASELINE_RE = re.compile(r"_N[0-9]{4}")
+_PROCESSING_DATE_RE = re.compile(r"_[0-9]{8}T[0-9]{6}\.SAFE")
+
 #################################################################
 ### Functions for preprocessing of Sentinel-2 L1C data to L2A ###
 #################################################################
@@ -48,13 +57,15 @@ def _which(program):
 
 ### Primary functions
 
-def _setGipp(gipp, median_filter = 0, v255 = False):
+def _setGipp(gipp, output_dir = None, median_filter = 0, v255 = False):
     """
     Function that tweaks options in sen2cor's L2A_GIPP.xml file to specify an output directory.
     
     Args:
         gipp: The path to a copy of the L2A_GIPP.xml file.
+        output_dir: Output directory, required for sen2cor v2.5.5 (v255 = True) which reads it from the GIPP file.
         median_filter: Set 0-3 to perform smoothing operation on classified scene. Not currently used.
+        v255: Set True to set options for sen2cor v2.5.5.
     Returns:
         The directory location of a temporary .gipp file, for input to L2A_Process
     """
@@ -63,9 +74,10 @@ def _setGipp(gipp, median_filter = 0, v255 = False):
     assert gipp != None, "GIPP file must be specified if you're changing sen2cor options."
     assert os.path.isfile(gipp), "GIPP XML options file doesn't exist at the location %s."%gipp  
     assert median_filter in [0, 1, 2, 3], "median_filter can only be 0-3."
+    if v255: assert output_dir != None, "output_dir must be specified for sen2cor v2.5.5."
        
     # Read GIPP file
-    tree = ET.ElementTree(file = gipp)
+    tree = ET.parse(gipp)
     root = tree.getroot()
     
     # Change output directory (if old version)
@@ -73,38 +85,45 @@ def _setGipp(gipp, median_filter = 0, v255 = False):
         
     root.find('Scene_Classification/Filters/Median_Filter').text = str(median_filter)
     
-    # Generate a temporary output file
-    temp_gipp = tempfile.mktemp(suffix='.xml')
-        
+    # Generate a unique temporary output file for each run, so that parallel runs never share settings
+    fd, temp_gipp = tempfile.mkstemp(suffix='.xml')
+    os.close(fd)
+    
     # Ovewrite old GIPP file with new options
-    tree.write(temp_gipp)
+    tree.write(temp_gipp, xml_declaration = True, encoding = 'UTF-8')
     
     return temp_gipp
 
 
-def getL2AFilename(L1C_file, output_dir = os.getcwd(), SAFE = False):
+def getL2AFilename(L1C_file, output_dir = None, SAFE = False):
     """
     Determine the level 2A tile path name from an input file (level 1C) tile.
     
     Args:
         L1C_file: Input level 1C .SAFE file tile (e.g. '/PATH/TO/*.SAFE/GRANULE/*').
-        output_dir: Directory of processed file.
+        output_dir: Directory of processed file. Defaults to current working directory.
         SAFE: Return path of base .SAFE file
     Returns:
         The name and directory of the output file
     """
     
-    # Determine output file name, replacing two instances only of substring L1C_ with L2A_    
-    outfile = re.sub(r"L1C_","L2A_", L1C_file)
+    # Default to the current working directory at the time of the call, not when the module was imported
+    if output_dir is None: output_dir = os.getcwd()
+    
+    # Keep only the .SAFE/GRANULE/granule part of the input path, so that the output is located in output_dir
+    outfile = '/'.join(L1C_file.rstrip('/').split('/')[-3:])
+    
+    # Determine output file name, replacing substring L1C_ with L2A_ in the .SAFE and granule names
+    outfile = outfile.replace("L1C_","L2A_")
     
     # Allow for changes in file format
-    outfile = re.sub(r"_N[0-9]{4}","_N????", outfile)
+    outfile = _BASELINE_RE.sub("_N????", outfile)
     
     # Replace _OPER_ with _USER_ for case of old file format (in final 2 cases)
     outfile = outfile[::-1].replace('_OPER_'[::-1],'_USER_'[::-1],2)[::-1]
     
     # Replace processing date
-    outfile = re.sub(r"_[0-9]{8}T[0-9]{6}.SAFE","_????????T??????.SAFE", outfile)
+    outfile = _PROCESSING_DATE_RE.sub("_????????T??????.SAFE", outfile)
     
     outpath = os.path.join(output_dir, outfile)
     
@@ -114,7 +133,31 @@ def getL2AFilename(L1C_file, output_dir = os.getcwd(), SAFE = False):
     return outpath.rstrip('/')
 
 
-def processToL2A(granule, gipp = None, output_dir = os.getcwd(), resolution = 0, sen2cor = 'L2A_Process', sen2cor_255 = None, product_format = 'SAFE_COMPACT', verbose = False):
+def findL2AOutput(outpath, output_files = None):
+    """
+    Find existing level 2A granules that match an output filename from getL2AFilename(), which contains wildcards.
+    
+    Args:
+        outpath: Path to a level 2A granule, from getL2AFilename().
+        output_files: Optionally specify a listing of the output directory, to avoid listing it again for each granule.
+    Returns:
+        A list of matching level 2A granules.
+    """
+    
+    outpath_SAFE = os.path.dirname(os.path.dirname(outpath))
+    output_dir = os.path.dirname(outpath_SAFE)
+    
+    if output_files is None: output_files = os.listdir(output_dir)
+    
+    # Match .SAFE files against the listing (skipping hidden files, as glob does), then only search GRANULE directories of those that match
+    granules = []
+    for SAFE_file in fnmatch.filter([f for f in output_files if not f.startswith('.')], os.path.basename(outpath_SAFE)):
+        granules.extend(glob.glob('%s/%s/GRANULE/%s'%(output_dir, SAFE_file, os.path.basename(outpath))))
+    
+    return granules
+
+
+def processToL2A(granule, gipp = None, output_dir = None, resolution = 0, sen2cor = 'L2A_Process', sen2cor_255 = None, product_format = 'SAFE_COMPACT', verbose = False):
     """
     Processes Sentinel-2 level 1C files to level L2A with sen2cor.
     
@@ -154,6 +197,7 @@ def processToL2A(granule, gipp = None, output_dir = os.getcwd(), resolution = 0,
     if sen2cor_255 is not None: assert _which(sen2cor_255) is not None, "Can't find program sen2cor (v2.5.5) given command (%s). Ensure that sen2cor (v2.5.5) has been correctly installed and that it's path has been specified correctly."%str(sen2cor_255)
     
     # Test that output directory is writeable
+    if output_dir is None: output_dir = os.getcwd()
     output_dir = os.path.abspath(os.path.expanduser(output_dir))
     assert os.path.exists(output_dir), "Output directory (%s) does not exist."%output_dir
     assert os.access(output_dir, os.W_OK), "Output directory (%s) does not have write permission. Try setting a different output directory"%output_dir
@@ -178,7 +222,7 @@ def processToL2A(granule, gipp = None, output_dir = os.getcwd(), resolution = 0,
         temp_gipp = _setGipp(gipp, median_filter = 0, v255 = False)
         command = [sen2cor, '--GIP_L2A', temp_gipp]
     else:
-        temp_gipp = _setGipp(gipp, median_filter = 0, v255 = True)
+        temp_gipp = _setGipp(gipp, output_dir = output_dir, median_filter = 0, v255 = True)
         command = [sen2cor_255, '--GIP_L2A', temp_gipp]
     
     # Specify resolution
@@ -196,17 +240,11 @@ def processToL2A(granule, gipp = None, output_dir = os.getcwd(), resolution = 0,
     # print(command for user info
     if verbose: print(' '.join(command))
     
-    # Do the processing, and capture exceptions
+    # Do the processing, tidying up the temporary options file whether or not it succeeds
     try:
         output_text = sen2mosaic.multiprocess.runCommand(command, verbose = verbose)
-        t=1
-    except Exception as e:
-        # Tidy up temporary options file
+    finally:
         os.remove(temp_gipp)
-        raise
-    
-    # Tidy up temporary options file
-    os.remove(temp_gipp)
     
     # Get path of .SAFE file.
     outpath_SAFE = getL2AFilename(granule, output_dir = output_dir, SAFE = True)
@@ -214,50 +252,57 @@ def processToL2A(granule, gipp = None, output_dir = os.getcwd(), resolution = 0,
     # Occasionally sen2cor outputs a _null directory. This can cause problems, so should be removed.
     bad_directories = glob.glob('%s/GRANULE/*_null/'%outpath_SAFE)
     
-    if bad_directories:
-        [shutil.rmtree(bd) for bd in bad_directories]
+    for bad_directory in bad_directories:
+        shutil.rmtree(bad_directory)
      
     return outpath
 
 
-def testCompletion(L1C_file, output_dir = os.getcwd(), resolution = 0):
+def testCompletion(L1C_file, output_dir = None, resolution = 0):
     """
     Test for successful completion of sen2cor processing. 
     
     Args:
         L1C_file: Path to level 1C granule file (e.g. /PATH/TO/*_L1C_*.SAFE/GRANULE/*)
+        output_dir: Directory of processed file. Defaults to current working directory.
+        resolution: Resolution to test (10, 20 or 60 m). Defaults to 0, which tests all three.
     Returns:
         A boolean describing whether processing completed sucessfully.
     """
       
     L2A_file = getL2AFilename(L1C_file, output_dir = output_dir, SAFE = False)
     
+    # Bands expected at each resolution
+    expected_bands = {10: ['B02', 'B03', 'B04', 'B08', 'AOT', 'TCI', 'WVP'],
+                      20: ['B02', 'B03', 'B04', 'B05', 'B06', 'B07', 'B8A', 'B11', 'B12', 'AOT', 'TCI', 'WVP', 'SCL'],
+                      60: ['B01', 'B02', 'B03', 'B04', 'B05', 'B06', 'B07', 'B8A', 'B11', 'B12', 'AOT', 'TCI', 'WVP', 'SCL']}
+    
+    resolutions = [10, 20, 60] if resolution == 0 else [resolution]
+    
+    # The output filename contains wildcards, so resolve it only once
+    L2A_granules = glob.glob(L2A_file)
+    
     failure = False
     
-    # Test all expected 10 m files are present
-    if resolution == 0 or resolution == 10:
+    for res in resolutions:
         
-        for band in ['B02', 'B03', 'B04', 'B08', 'AOT', 'TCI', 'WVP']:
-            
-            if not len(glob.glob('%s/IMG_DATA/R10m/*_%s_10m.jp2'%(L2A_file,band))) == 1:
-                failure = True
-    
-    # Test all expected 20 m files are present
-    if resolution == 0 or resolution == 20:
+        # Count files for each band (named *_BAND_RESm.jp2), listing each image directory only once
+        suffix = '_%sm.jp2'%str(res)
+        band_counts = {}
         
-        for band in ['B02', 'B03', 'B04', 'B05', 'B06', 'B07', 'B8A', 'B11', 'B12', 'AOT', 'TCI', 'WVP', 'SCL']:
+        for L2A_granule in L2A_granules:
             
-            if not len(glob.glob('%s/IMG_DATA/R20m/*_%s_20m.jp2'%(L2A_file,band))) == 1:
-                
-                failure = True
-
-    # Test all expected 60 m files are present
-    if resolution == 0 or resolution == 60:
-        
-        for band in ['B01', 'B02', 'B03', 'B04', 'B05', 'B06', 'B07', 'B8A', 'B11', 'B12', 'AOT', 'TCI', 'WVP', 'SCL']:
+            image_dir = '%s/IMG_DATA/R%sm'%(L2A_granule, str(res))
+            if not os.path.isdir(image_dir): continue
             
-            if not len(glob.glob('%s/IMG_DATA/R60m/*_%s_60m.jp2'%(L2A_file,band))) == 1:
-                
+            for filename in os.listdir(image_dir):
+                if filename.startswith('.') or not filename.endswith(suffix): continue
+                band = filename[:-len(suffix)].split('_')[-1]
+                band_counts[band] = band_counts.get(band, 0) + 1
+        
+        # Test all expected files are present
+        for band in expected_bands[res]:
+            if band_counts.get(band, 0) != 1:
                 failure = True
     
     # At present we only report failure/success, can be extended to type of failure 
@@ -9,6 +9,7 @@ setup(name='sen2mosaic',
       author='Samuel Bowers',
       author_email='sam.bowers@ed.ac.uk',
       license='GNU General Public License',
+      python_requires='>=3.6',
       zip_safe=False)
 
 #      install_requires=['argparse', 'copy', 'datetime', 'functools', 'glob', 'multiprocessing', 'numpy', 'os', 'osgeo', 'pandas', 'pdb', 'psutil', 'queue', 're', 'scipy', 'sentinelsat', 'shutil', 'signal', 'subprocess', 'tempfile', 'time', 'xml', 'zipfile']